@@ -23,6 +23,9 @@ import (
 // 全局提取器实例
 var extractorInstance *extractor.Extractor
 
+// allowedExts 允许上传的文件扩展名 (包级常量表，避免每个请求重新构建)
+var allowedExts = map[string]bool{".pdf": true, ".docx": true, ".jpg": true, ".jpeg": true, ".png": true}
+
 // IPRateLimiter 简单的 IP 限流器
 type IPRateLimiter struct {
 	requests map[string][]time.Time
@@ -172,7 +175,6 @@ func handleExtract(c echo.Context) error {
 
 	// 2. 验证文件类型
 	ext := strings.ToLower(filepath.Ext(file.Filename))
-	allowedExts := map[string]bool{".pdf": true, ".docx": true, ".jpg": true, ".jpeg": true, ".png": true}
 	if !allowedExts[ext] {
 		return c.JSON(http.StatusBadRequest, ExtractResponse{
 			Success: false,
@@ -221,17 +223,11 @@ func handleExtract(c echo.Context) error {
 		fmt.Println("警告: 返回了空记录列表")
 	}
 
-	// 6. 获取字段标签
-	labels := make(map[string]string)
-	for k, p := range extractor.PatternRegistry {
-		labels[k] = p.Label
-	}
-
 	return c.JSON(http.StatusOK, ExtractResponse{
 		Success:     true,
 		RecordCount: len(records),
 		Records:     records,
-		FieldLabels: labels,
+		FieldLabels: extractor.FieldLabels,
 	})
 }
 
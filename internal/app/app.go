@@ -282,17 +282,11 @@ func (a *App) PreviewData(inputPath string, fields []string) ExtractResult {
 		}
 	}
 
-	// Get labels for UI
-	labels := make(map[string]string)
-	for k, p := range extractor.PatternRegistry {
-		labels[k] = p.Label
-	}
-
 	return ExtractResult{
 		Success:     true,
 		RecordCount: len(records),
 		Records:     records,
-		FieldLabels: labels,
+		FieldLabels: extractor.FieldLabels,
 	}
 }
 
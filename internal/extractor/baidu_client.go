@@ -1,10 +1,12 @@
 package extractor
 
 import (
+	"bufio"
 	"bytes"
 	"encoding/base64"
 	"encoding/json"
 	"fmt"
+	"io"
 	"legal-extractor/internal/config"
 	"log/slog"
 	"net/http"
@@ -61,7 +63,9 @@ func (c *BaiduClient) ParseDocument(fileData []byte, isPdf bool, onProgress Prog
 	}
 
 	// 1. 处理超长文档 (百度 API 限制单次 100 页)
-	var allPagesMarkdown []string
+	// 每批页面识别完成后立即解析为记录，不在内存中累积整份文档的 Markdown
+	var allRecords []Record
+	parsedPages := 0
 	const maxPagesPerChunk = 20 // 调小切片粒度（从50改为20）以显著提升云端解析的稳定性
 
 	if isPdf {
@@ -118,7 +122,8 @@ func (c *BaiduClient) ParseDocument(fileData []byte, isPdf bool, onProgress Prog
 						return nil, err // 其他严重错误或重试耗尽则退出
 					}
 
-					allPagesMarkdown = append(allPagesMarkdown, pages...)
+					allRecords = append(allRecords, c.parsePages(pages, parsedPages, totalPages, onProgress)...)
+					parsedPages += len(pages)
 
 					// 3. 强制冷却，防止连续高压导致百度后端崩溃
 					if end < totalPages {
@@ -134,7 +139,7 @@ func (c *BaiduClient) ParseDocument(fileData []byte, isPdf bool, onProgress Prog
 				if err != nil {
 					return nil, err
 				}
-				allPagesMarkdown = append(allPagesMarkdown, pages...)
+				allRecords = c.parsePages(pages, 0, len(pages), onProgress)
 			}
 		}
 	} else {
@@ -145,58 +150,78 @@ func (c *BaiduClient) ParseDocument(fileData []byte, isPdf bool, onProgress Prog
 		if err != nil {
 			return nil, err
 		}
-		allPagesMarkdown = append(allPagesMarkdown, pages...)
+		allRecords = c.parsePages(pages, 0, len(pages), onProgress)
 	}
 
-	// 2. 按页解析汇总后的 Markdown
-	c.logger.Info("所有页面识别完成，开始按页提取法律实体", "totalFetchedPages", len(allPagesMarkdown))
-	var allRecords []Record
-	totalPages := len(allPagesMarkdown)
-	for i, pageMd := range allPagesMarkdown {
+	c.logger.Info("数据提取完成", "recordCount", len(allRecords))
+	return allRecords, nil
+}
+
+// parsePages 按页解析一批页面的 Markdown 并标注页码，pageOffset 为该批之前已解析的页数
+func (c *BaiduClient) parsePages(pages []string, pageOffset, totalPages int, onProgress ProgressCallback) []Record {
+	if totalPages < pageOffset+len(pages) {
+		totalPages = pageOffset + len(pages)
+	}
+
+	var records []Record
+	for i, pageMd := range pages {
+		pageNum := pageOffset + i + 1
 		if onProgress != nil {
 			// 增加微小延迟 (50ms)，让前端有足够时间渲染进度条的跳动，避免瞬间完成
 			time.Sleep(50 * time.Millisecond)
-			onProgress(i+1, totalPages, fmt.Sprintf("正在结构化提取第 %d/%d 页的法律信息...", i+1, totalPages))
+			onProgress(pageNum, totalPages, fmt.Sprintf("正在结构化提取第 %d/%d 页的法律信息...", pageNum, totalPages))
 		}
-		records := ParseMarkdown(pageMd)
-		for _, rec := range records {
+		for _, rec := range ParseMarkdown(pageMd) {
 			// 标注准确的页码
 			if rec["page"] == "" {
-				rec["page"] = fmt.Sprintf("%d", i+1)
+				rec["page"] = fmt.Sprintf("%d", pageNum)
 			}
-			allRecords = append(allRecords, rec)
+			records = append(records, rec)
 		}
 	}
+	return records
+}
 
-	c.logger.Info("数据提取完成", "recordCount", len(allRecords))
-	return allRecords, nil
+// newLayoutParsingBody 以流式方式生成 Layout Parsing 请求体：文件内容边 Base64 编码边写入连接，
+// 无需在内存中同时保存 Base64 字符串和序列化后的 JSON 两份完整副本
+func newLayoutParsingBody(fileData []byte, fileType int) (io.ReadCloser, int64) {
+	// Base64 字母表均为 JSON 安全字符，可直接拼接在字符串字面量中
+	head := `{"file":"`
+	tail := fmt.Sprintf(`","fileType":%d,"useDocOrientationClassify":false,"useDocUnwarping":false,"useChartRecognition":false}`, fileType)
+	size := int64(len(head) + base64.StdEncoding.EncodedLen(len(fileData)) + len(tail))
+
+	pr, pw := io.Pipe()
+	go func() {
+		bw := bufio.NewWriterSize(pw, 64*1024)
+		bw.WriteString(head)
+		enc := base64.NewEncoder(base64.StdEncoding, bw)
+		enc.Write(fileData)
+		enc.Close()
+		bw.WriteString(tail)
+		pw.CloseWithError(bw.Flush())
+	}()
+	return pr, size
 }
 
 // callBaiduAPI 封装底层的 API 调用逻辑
 func (c *BaiduClient) callBaiduAPI(fileData []byte, isPdf bool, onProgress ProgressCallback) ([]string, error) {
 	c.logger.Info("正在向百度 AI Studio 发送 POST 请求...")
-	fileBase64 := base64.StdEncoding.EncodeToString(fileData)
 	fileType := 1
 	if isPdf {
 		fileType = 0
 	}
 
-	payload := map[string]any{
-		"file":                      fileBase64,
-		"fileType":                  fileType,
-		"useDocOrientationClassify": false,
-		"useDocUnwarping":           false,
-		"useChartRecognition":       false,
-	}
-
-	jsonBody, err := json.Marshal(payload)
+	body, contentLength := newLayoutParsingBody(fileData, fileType)
+	req, err := http.NewRequest("POST", c.config.ApiUrl, body)
 	if err != nil {
+		body.Close()
 		return nil, err
 	}
-
-	req, err := http.NewRequest("POST", c.config.ApiUrl, bytes.NewBuffer(jsonBody))
-	if err != nil {
-		return nil, err
+	req.ContentLength = contentLength
+	// 流式请求体只能读取一次；提供 GetBody 以便 net/http 在需要重放请求时 (如 HTTP/2 GOAWAY) 重新生成
+	req.GetBody = func() (io.ReadCloser, error) {
+		body, _ := newLayoutParsingBody(fileData, fileType)
+		return body, nil
 	}
 
 	req.Header.Set("Content-Type", "application/json")
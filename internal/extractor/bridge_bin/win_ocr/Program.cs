@@ -1,6 +1,7 @@
 using System;
 using System.IO;
 using System.Runtime.InteropServices.WindowsRuntime;
+using System.Text;
 using System.Threading.Tasks;
 using Windows.Data.Pdf;
 using Windows.Graphics.Imaging;
@@ -9,11 +10,22 @@ using Windows.Storage.Streams;
 
 class Program
 {
+    // 常驻模式下每个请求的识别结果之后输出的分隔符，调用方据此判断响应结束
+    const char PageSeparator = '\f';
+
     static async Task<int> Main(string[] args)
     {
+        // 与 Go 调用方约定使用 UTF-8 交换文件路径与识别文本
+        Console.InputEncoding = new UTF8Encoding(false);
+        Console.OutputEncoding = new UTF8Encoding(false);
+
+        if (args.Length == 1 && args[0] == "--serve")
+            return await ServeAsync();
+
         if (args.Length < 2)
         {
             Console.WriteLine("Usage: WinOcrBridge <pdfPath> <pageNumber>");
+            Console.WriteLine("       WinOcrBridge --serve");
             return 1;
         }
 
@@ -26,7 +38,10 @@ class Program
 
         try
         {
-            string text = await RecognizePdfPageAsync(pdfPath, pageNumber);
+            using var source = new InMemoryRandomAccessStream();
+            var pdfDoc = await LoadPdfAsync(pdfPath, source);
+            using var renderBuffer = new InMemoryRandomAccessStream();
+            string text = await RecognizePdfPageAsync(pdfDoc, CreateOcrEngine(), renderBuffer, pageNumber);
             Console.WriteLine(text);
             return 0;
         }
@@ -37,28 +52,96 @@ class Program
         }
     }
 
-    static async Task<string> RecognizePdfPageAsync(string pdfPath, int pageNumber)
+    // ServeAsync 常驻模式：逐行读取 "<pdfPath>\t<pageNumber>" 请求，输出识别文本并以分隔符结束。
+    // 空行表示调用方已处理完当前文档，释放缓存的文档与缓冲区，不输出响应。
+    // 识别引擎在进程生命周期内只初始化一次，标准输入关闭时退出
+    static async Task<int> ServeAsync()
     {
-        // 1. 加载 PDF 文档
-        var file = await Windows.Storage.StorageFile.GetFileFromPathAsync(Path.GetFullPath(pdfPath));
-        var pdfDoc = await PdfDocument.LoadFromFileAsync(file);
+        OcrEngine engine;
+        try
+        {
+            engine = CreateOcrEngine();
+        }
+        catch (Exception ex)
+        {
+            Console.Error.WriteLine($"Error: {ex.Message}");
+            return 1;
+        }
 
-        if (pageNumber > pdfDoc.PageCount)
-            throw new Exception("Page number out of range.");
+        // 同一文档的各页请求通常连续到达，缓存最近加载的文档，避免每页都重新读取并解析整个 PDF。
+        // 以路径 + 修改时间 + 文件大小作为标识，临时文件路径被复用时也不会命中旧文档
+        string? cachedKey = null;
+        PdfDocument? cachedDoc = null;
+        using var source = new InMemoryRandomAccessStream();
+        using var renderBuffer = new InMemoryRandomAccessStream();
 
-        // 2. 获取并渲染指定页面
-        using var page = pdfDoc.GetPage((uint)pageNumber - 1);
-        using var stream = new InMemoryRandomAccessStream();
+        string? line;
+        while ((line = Console.ReadLine()) != null)
+        {
+            if (line.Length == 0)
+            {
+                // 进程即将回到空闲池，不再长期持有上一个文档的内存副本与渲染位图
+                cachedDoc = null;
+                cachedKey = null;
+                source.Size = 0;
+                renderBuffer.Size = 0;
+                continue;
+            }
 
-        // 渲染为高分辨率位图以提高 OCR 准确率 (DPI 设为 300)
-        var options = new PdfPageRenderOptions { DestinationWidth = (uint)(page.Size.Width * 3) };
-        await page.RenderToStreamAsync(stream, options);
+            try
+            {
+                string[] parts = line.Split('\t');
+                if (parts.Length != 2 || !int.TryParse(parts[1], out int pageNumber) || pageNumber < 1)
+                    throw new Exception($"Invalid request: {line}");
 
-        // 3. 解码图像数据
-        var decoder = await BitmapDecoder.CreateAsync(stream);
-        using var softwareBitmap = await decoder.GetSoftwareBitmapAsync();
+                var info = new FileInfo(Path.GetFullPath(parts[0]));
+                string key = $"{info.FullName}|{info.LastWriteTimeUtc.Ticks}|{info.Length}";
+                if (cachedDoc == null || key != cachedKey)
+                {
+                    cachedDoc = null;
+                    cachedDoc = await LoadPdfAsync(info.FullName, source);
+                    cachedKey = key;
+                }
+                Console.Write(await RecognizePdfPageAsync(cachedDoc, engine, renderBuffer, pageNumber));
+            }
+            catch (Exception ex)
+            {
+                // 单个请求失败只输出空结果，进程继续服务后续请求
+                Console.Error.WriteLine($"Error: {ex.Message}");
+            }
+            Console.Write(PageSeparator);
+            Console.Out.Flush();
+        }
+        return 0;
+    }
+
+    // OCR 渲染目标分辨率：200 DPI 已足以识别常规字号，更高只会成倍增加识别耗时
+    const double TargetDpi = 200;
 
-        // 4. 执行系统原生 OCR
+    // RenderScaleFor 根据页面尺寸 (DIP, 1/96 英寸) 计算渲染倍率，并保证不超过 OCR 引擎支持的最大边长
+    static double RenderScaleFor(double width, double height)
+    {
+        double scale = TargetDpi / 96.0;
+        double longest = Math.Max(width, height);
+        if (longest > 0 && longest * scale > OcrEngine.MaxImageDimension)
+            scale = OcrEngine.MaxImageDimension / longest;
+        return scale;
+    }
+
+    // LoadPdfAsync 将文件读入 source (覆盖其原有内容) 后加载文档，source 需在文档使用期间保持有效
+    static async Task<PdfDocument> LoadPdfAsync(string pdfPath, InMemoryRandomAccessStream source)
+    {
+        // 读入内存后加载，避免常驻进程持有文件句柄，导致调用方无法删除临时文件
+        byte[] data = await File.ReadAllBytesAsync(Path.GetFullPath(pdfPath));
+        source.Size = 0;
+        source.Seek(0);
+        await source.WriteAsync(data.AsBuffer());
+        source.Seek(0);
+        return await PdfDocument.LoadFromStreamAsync(source);
+    }
+
+    static OcrEngine CreateOcrEngine()
+    {
         // 优先使用中文简体，如果没装则使用系统默认
         var lang = new Windows.Globalization.Language("zh-Hans-CN");
         var engine = OcrEngine.IsLanguageSupported(lang)
@@ -67,7 +150,38 @@ class Program
 
         if (engine == null)
             throw new Exception("OCR Engine could not be initialized.");
+        return engine;
+    }
+
+    // RecognizePdfPageAsync 识别单页。renderBuffer 由调用方跨页复用，每页渲染前清空，
+    // 避免每页重新创建渲染缓冲区
+    static async Task<string> RecognizePdfPageAsync(PdfDocument pdfDoc, OcrEngine engine, InMemoryRandomAccessStream renderBuffer, int pageNumber)
+    {
+        if (pageNumber > pdfDoc.PageCount)
+            throw new Exception("Page number out of range.");
+
+        // 1. 获取并渲染指定页面
+        using var page = pdfDoc.GetPage((uint)pageNumber - 1);
+        renderBuffer.Size = 0;
+        renderBuffer.Seek(0);
+
+        // 按目标 DPI 渲染位图，识别耗时与像素数近似线性相关
+        // 默认输出 PNG，会对整页位图做一次 zlib 压缩再立即解码；改用无压缩的 BMP 省去这次往返
+        double scale = RenderScaleFor(page.Size.Width, page.Size.Height);
+        var options = new PdfPageRenderOptions
+        {
+            DestinationWidth = (uint)(page.Size.Width * scale),
+            DestinationHeight = (uint)(page.Size.Height * scale),
+            BitmapEncoderId = BitmapEncoder.BmpEncoderId
+        };
+        await page.RenderToStreamAsync(renderBuffer, options);
+
+        // 2. 解码图像数据
+        renderBuffer.Seek(0);
+        var decoder = await BitmapDecoder.CreateAsync(renderBuffer);
+        using var softwareBitmap = await decoder.GetSoftwareBitmapAsync();
 
+        // 3. 执行系统原生 OCR
         var result = await engine.RecognizeAsync(softwareBitmap);
         return result.Text;
     }
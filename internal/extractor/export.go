@@ -109,37 +109,38 @@ func ExportExcel(path string, records []Record) error {
 	}
 
 	// Set headers
-	for i, header := range headers {
-		cell, err := excelize.CoordinatesToCellName(i+1, 1)
+	if err := f.SetSheetRow(sheetName, "A1", &headers); err != nil {
+		return err
+	}
+
+	// 2. Set values one row at a time
+	row := make([]interface{}, len(keys))
+	for i, r := range records {
+		for j, k := range keys {
+			row[j] = r[k]
+		}
+		cell, err := excelize.CoordinatesToCellName(1, i+2)
 		if err != nil {
 			return err
 		}
-		if err := f.SetCellValue(sheetName, cell, header); err != nil {
+		if err := f.SetSheetRow(sheetName, cell, &row); err != nil {
 			return err
 		}
 	}
 
-	// 2. Set values
-	wrapStyle, _ := f.NewStyle(&excelize.Style{
-		Alignment: &excelize.Alignment{
-			WrapText: true,
-			Vertical: "top",
-		},
-	})
-
-	for i, r := range records {
-		row := i + 2
-		for j, k := range keys {
-			cell, err := excelize.CoordinatesToCellName(j+1, row)
-			if err != nil {
-				return err
-			}
-			if err := f.SetCellValue(sheetName, cell, r[k]); err != nil {
-				return err
-			}
-			// Apply wrap text style
-			f.SetCellStyle(sheetName, cell, cell, wrapStyle)
+	// Apply wrap text style to the whole data range in a single call
+	if len(keys) > 0 {
+		wrapStyle, _ := f.NewStyle(&excelize.Style{
+			Alignment: &excelize.Alignment{
+				WrapText: true,
+				Vertical: "top",
+			},
+		})
+		lastCell, err := excelize.CoordinatesToCellName(len(keys), len(records)+1)
+		if err != nil {
+			return err
 		}
+		f.SetCellStyle(sheetName, "A2", lastCell, wrapStyle)
 	}
 
 	// Set column widths for better readability
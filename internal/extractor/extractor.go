@@ -3,32 +3,106 @@ package extractor
 import (
 	"archive/zip"
 	"bytes"
+	"container/list"
 	"context"
 	"crypto/sha256"
 	"encoding/xml"
+	"errors"
 	"fmt"
 	"io"
 	"log/slog"
 	"os"
-	"os/exec"
 	"path/filepath"
-	"regexp"
 	"runtime"
-	"sort"
 	"strings"
 	"sync"
+	"sync/atomic"
 	"time"
+	"unicode"
+	"unicode/utf8"
 
 	"github.com/dslipak/pdf"
 	"github.com/pdfcpu/pdfcpu/pkg/api"
 )
 
+// maxCacheEntries 结果缓存的最大文件数，超出后淘汰最久未使用的条目，防止长时间运行时内存持续增长
+const maxCacheEntries = 64
+
+// localPageTimeout 本地文本层单页解析的最长等待时间
+const localPageTimeout = 10 * time.Second
+
+// maxPageWorkers 逐页并行处理的最大并发数，防止内存波动过大 (OCR 桥接进程也较重)
+const maxPageWorkers = 8
+
+// maxPageTimeouts 单个文档允许的文本层解析超时页数，达到后不再解析该文档的剩余页面
+const maxPageTimeouts = 3
+
+// pageSkippedError 单页被跳过 (如解析超时、识别失败)：不中止整个文档，原因通过进度回调告知用户
+type pageSkippedError struct {
+	reason string
+}
+
+func (e *pageSkippedError) Error() string {
+	return e.reason
+}
+
 // Extractor 处理器，负责协调不同格式的提取策略
 type Extractor struct {
 	logger      *slog.Logger
 	baiduClient *BaiduClient
-	cache       map[string][]Record
-	cacheMu     sync.RWMutex
+	cache       map[string]*list.Element // 内容哈希 -> cacheOrder 中的节点
+	cacheOrder  *list.List               // 按最近使用排序，表头为最新
+	cacheMu     sync.Mutex
+	inflight    map[string]*inflightCall // 与缓存相同的 Key -> 正在进行的提取任务，与缓存共用 cacheMu
+	ocrBridges  *winOcrBridgePool
+}
+
+// cacheEntry 结果缓存条目
+type cacheEntry struct {
+	hash    string
+	records []Record
+}
+
+// inflightCall 正在进行的提取任务，相同内容的并发请求等待同一次提取的结果
+type inflightCall struct {
+	done    chan struct{}
+	records []Record
+	err     error
+
+	progressMu sync.Mutex
+	listeners  []ProgressCallback // 发起者与各等待者的进度回调
+	last       *progressEvent     // 最近一次进度，供中途加入的等待者立即同步
+}
+
+// progressEvent 一次进度通知
+type progressEvent struct {
+	current, total int
+	message        string
+}
+
+// subscribe 登记一个进度回调，并立即补发最近一次进度
+func (c *inflightCall) subscribe(cb ProgressCallback) {
+	if cb == nil {
+		return
+	}
+	c.progressMu.Lock()
+	defer c.progressMu.Unlock()
+
+	c.listeners = append(c.listeners, cb)
+	if c.last != nil {
+		cb(c.last.current, c.last.total, c.last.message)
+	}
+}
+
+// progress 将提取进度广播给所有调用方 (持锁回调以保证各方收到的顺序一致)
+func (c *inflightCall) progress(current, total int, message string) {
+	c.progressMu.Lock()
+	defer c.progressMu.Unlock()
+
+	c.last = &progressEvent{current: current, total: total, message: message}
+	for _, cb := range c.listeners {
+		cb(current, total, message)
+	}
 }
 
 // NewExtractor 创建一个新的提取器实例
@@ -39,7 +113,10 @@ func NewExtractor(logger *slog.Logger) *Extractor {
 	return &Extractor{
 		logger:      logger,
 		baiduClient: NewBaiduClient(logger),
-		cache:       make(map[string][]Record),
+		cache:       make(map[string]*list.Element),
+		cacheOrder:  list.New(),
+		inflight:    make(map[string]*inflightCall),
+		ocrBridges:  &winOcrBridgePool{},
 	}
 }
 
@@ -59,43 +136,123 @@ func (e *Extractor) ExtractData(fileData []byte, fileName string, fields []strin
 	e.logger.Info("开始提取数据", "file", fileName, "size", len(fileData), "fields", fields)
 	ext := strings.ToLower(filepath.Ext(fileName))
 
-	// 1. 检查缓存 (使用文件内容的 SHA256 哈希作为 Key)
+	// 1. 检查缓存 (使用扩展名 + 文件内容的 SHA256 哈希作为 Key)
+	//    提取结果取决于按哪种格式解析，相同内容以不同扩展名提交时各自处理、互不共享结果与错误
 	fileHash := e.calculateHash(fileData)
-	e.cacheMu.RLock()
-	if cached, ok := e.cache[fileHash]; ok {
+	cacheKey := ext + ":" + fileHash
+	if cached, ok := e.getCached(cacheKey); ok {
 		e.logger.Info("命中内容哈希缓存，跳过提取", "file", fileName, "hash", fileHash[:8])
-		e.cacheMu.RUnlock()
 		return cached, nil
 	}
-	e.cacheMu.RUnlock()
 
-	var records []Record
-	var err error
+	// 2. 相同文件正在提取时 (如重复上传、连续点击)，等待其结果并同步接收进度，避免重复解析或重复调用云端识别
+	call, leader := e.joinInflight(cacheKey)
+	if !leader {
+		e.logger.Info("相同内容的文件正在提取，等待其结果", "file", fileName, "hash", fileHash[:8])
+		call.subscribe(onProgress)
+		<-call.done
+		return call.records, call.err
+	}
+	defer e.finishInflight(cacheKey, call)
+
+	// 发起者没有进度回调时 (Web 服务) 不注入广播回调，避免触发仅为界面准备的节流等待
+	var progress ProgressCallback
+	if onProgress != nil {
+		call.subscribe(onProgress)
+		progress = call.progress
+	}
+
+	call.records, call.err = e.extractByType(fileData, fileName, ext, fields, progress)
+	return call.records, call.err
+}
 
+// extractByType 按扩展名分派到具体的提取实现
+func (e *Extractor) extractByType(fileData []byte, fileName, ext string, fields []string, onProgress ProgressCallback) ([]Record, error) {
 	switch ext {
 	case ".pdf":
-		records, err = e.extractPdf(fileData, fields, onProgress)
+		return e.extractPdf(fileData, fields, onProgress)
 	case ".jpg", ".png", ".jpeg":
 		return nil, fmt.Errorf("图片识别功能已暂时禁用（仅支持PDF）")
 	case ".docx":
 		e.logger.Info("使用本地原生逻辑提取 DOCX", "file", fileName)
-		records, err = e.extractFromDocx(fileData, fields)
+		return e.extractFromDocx(fileData, fields)
 	default:
 		return nil, fmt.Errorf("不支持的文件格式: %s", ext)
 	}
+}
 
-	if err != nil {
-		return nil, err
+// joinInflight 登记一次提取任务。若相同 key 的任务正在进行，或已在登记前完成并写入缓存，
+// 返回可等待的任务且 leader 为 false；否则登记新任务，由调用方完成后调用 finishInflight
+func (e *Extractor) joinInflight(key string) (call *inflightCall, leader bool) {
+	e.cacheMu.Lock()
+	defer e.cacheMu.Unlock()
+
+	if call, ok := e.inflight[key]; ok {
+		return call, false
+	}
+	if elem, ok := e.cache[key]; ok {
+		call = &inflightCall{done: make(chan struct{}), records: elem.Value.(*cacheEntry).records}
+		close(call.done)
+		return call, false
+	}
+
+	call = &inflightCall{done: make(chan struct{})}
+	e.inflight[key] = call
+	return call, true
+}
+
+// finishInflight 写入缓存 (仅当结果非空时)，然后注销任务并唤醒等待者。须由发起者直接 defer 调用：
+// 提取过程 panic 时先为等待者设置错误，避免其把中止误当作"没有记录"，唤醒后再在发起者中继续 panic
+func (e *Extractor) finishInflight(key string, call *inflightCall) {
+	r := recover()
+	if r != nil {
+		call.records, call.err = nil, fmt.Errorf("提取过程异常中止: %v", r)
 	}
 
-	// 2. 写入缓存 (仅当结果非空时)
-	if len(records) > 0 {
-		e.cacheMu.Lock()
-		e.cache[fileHash] = records
-		e.cacheMu.Unlock()
+	if call.err == nil && len(call.records) > 0 {
+		e.putCached(key, call.records)
 	}
 
-	return records, nil
+	e.cacheMu.Lock()
+	delete(e.inflight, key)
+	e.cacheMu.Unlock()
+	close(call.done)
+
+	if r != nil {
+		panic(r)
+	}
+}
+
+// getCached 读取缓存结果，并将其标记为最近使用
+func (e *Extractor) getCached(hash string) ([]Record, bool) {
+	e.cacheMu.Lock()
+	defer e.cacheMu.Unlock()
+
+	elem, ok := e.cache[hash]
+	if !ok {
+		return nil, false
+	}
+	e.cacheOrder.MoveToFront(elem)
+	return elem.Value.(*cacheEntry).records, true
+}
+
+// putCached 写入缓存结果，超出容量时淘汰最久未使用的条目
+func (e *Extractor) putCached(hash string, records []Record) {
+	e.cacheMu.Lock()
+	defer e.cacheMu.Unlock()
+
+	if elem, ok := e.cache[hash]; ok {
+		elem.Value.(*cacheEntry).records = records
+		e.cacheOrder.MoveToFront(elem)
+		return
+	}
+
+	e.cache[hash] = e.cacheOrder.PushFront(&cacheEntry{hash: hash, records: records})
+	for e.cacheOrder.Len() > maxCacheEntries {
+		oldest := e.cacheOrder.Back()
+		e.cacheOrder.Remove(oldest)
+		delete(e.cache, oldest.Value.(*cacheEntry).hash)
+	}
 }
 
 // calculateHash 计算文件内容的 SHA256 哈希值
@@ -109,10 +266,16 @@ func (e *Extractor) extractPdf(fileData []byte, fields []string, onProgress Prog
 	e.logger.Info("正在解析 PDF 结构...", "bytes", len(fileData))
 
 	// 1. 获取总页数 (增加多库回退逻辑以提高鲁棒性)
+	// 该 Reader 同时供文本层探测与批量提取复用，整个流程只解析一次 PDF 结构
 	totalPages := 1
 	e.logger.Debug("尝试使用 dslipak/pdf 获取页数")
 	r, err := pdf.NewReader(bytes.NewReader(fileData), int64(len(fileData)))
-	if err == nil {
+	if errors.Is(err, pdf.ErrInvalidPassword) {
+		// 加密文档无论文本层还是 OCR 都无法处理，直接返回约定的错误码，跳过后续回退与识别尝试
+		return nil, fmt.Errorf("PDF_ENCRYPTED_OR_LOCKED: %w", err)
+	}
+	textLayerReadable := err == nil
+	if textLayerReadable {
 		totalPages = r.NumPage()
 		e.logger.Info("dslipak/pdf 解析成功", "totalPages", totalPages)
 	} else {
@@ -128,28 +291,24 @@ func (e *Extractor) extractPdf(fileData []byte, fields []string, onProgress Prog
 	}
 
 	// 2. 探测第一页文本层 (带超时保护，防止复杂 PDF 导致挂起)
-	e.logger.Info("正在尝试提取第一页文本层以判断解析模式...")
-
-	ctx, cancel := context.WithTimeout(context.Background(), 2*time.Second)
-	defer cancel()
-
-	textChan := make(chan string, 1)
-	go func() {
-		t, _ := e.extractPageTextLocally(fileData, 1)
-		textChan <- t
-	}()
-
+	// dslipak/pdf 无法打开的文件不可能读出文本层，直接进入 OCR，省去一次注定失败的重复解析
 	var firstPageText string
-	select {
-	case firstPageText = <-textChan:
-		e.logger.Debug("文本层探测完成")
-	case <-ctx.Done():
-		e.logger.Warn("文本层探测超时，自动切换至 OCR 模式")
+	if textLayerReadable {
+		e.logger.Info("正在尝试提取第一页文本层以判断解析模式...")
+
+		if text, ok := e.extractPageTextWithTimeout(r, 1, 2*time.Second); ok {
+			firstPageText = text
+			e.logger.Debug("文本层探测完成")
+		} else {
+			e.logger.Warn("文本层探测超时，自动切换至 OCR 模式")
+		}
+	} else {
+		e.logger.Info("PDF 文本层不可读，跳过文本层探测")
 	}
 
 	if len(strings.TrimSpace(firstPageText)) > 20 {
 		e.logger.Info("检测到 PDF 文本层，切换至 [本地高速解析] 模式")
-		return e.batchExtractLocalPdf(fileData, fields, totalPages, onProgress)
+		return e.batchExtractLocalPdf(r, firstPageText, fields, totalPages, onProgress)
 	}
 
 	e.logger.Info("未检测到 PDF 文本层或文本过少，切换至 [云端识别] 模式")
@@ -161,64 +320,140 @@ func (e *Extractor) extractPdf(fileData []byte, fields []string, onProgress Prog
 	}
 
 	e.logger.Info("未配置百度 Token，回退至 [本地系统识别] 模式")
-	return e.extractViaWinOcr(fileData, totalPages, onProgress)
+	return e.extractViaWinOcr(fileData, fields, totalPages, onProgress)
 }
 
-// extractPageTextLocally 本地提取指定页码的文本
-func (e *Extractor) extractPageTextLocally(fileData []byte, pageNum int) (string, error) {
-	r, err := pdf.NewReader(bytes.NewReader(fileData), int64(len(fileData)))
-	if err != nil {
-		return "", err
-	}
-
+// extractPageTextLocally 本地提取指定页码的文本 (复用已解析的 Reader)
+func (e *Extractor) extractPageTextLocally(r *pdf.Reader, pageNum int) (string, error) {
 	if pageNum > r.NumPage() {
 		return "", fmt.Errorf("页码 %d 超出范围 (总页数: %d)", pageNum, r.NumPage())
 	}
 
 	p := r.Page(pageNum)
+	// 没有字体资源的页面 (扫描图片、印章/签名等纯图形页) 不可能包含文本层，
+	// 直接跳过，避免完整解释其可能很大的内容流
+	if len(p.Fonts()) == 0 {
+		return "", nil
+	}
 	text, _ := p.GetPlainText(nil)
 	return text, nil
 }
 
+// extractPageTextWithTimeout 带超时保护地提取单页文本层，超时返回 ok=false
+// 超时后解析协程仍会在后台运行至结束，但调用方不再等待，避免个别异常复杂的页面拖住整个任务
+func (e *Extractor) extractPageTextWithTimeout(r *pdf.Reader, pageNum int, timeout time.Duration) (string, bool) {
+	ctx, cancel := context.WithTimeout(context.Background(), timeout)
+	defer cancel()
+
+	textChan := make(chan string, 1)
+	go func() {
+		t, _ := e.extractPageTextLocally(r, pageNum)
+		textChan <- t
+	}()
+
+	select {
+	case text := <-textChan:
+		return text, true
+	case <-ctx.Done():
+		return "", false
+	}
+}
+
 // batchExtractLocalPdf 批量本地提取 PDF 文本层 (并发加速版)
-func (e *Extractor) batchExtractLocalPdf(fileData []byte, fields []string, totalPages int, onProgress ProgressCallback) ([]Record, error) {
-	e.logger.Info("启动并行提取引擎", "workers", runtime.NumCPU())
+// firstPageText 为探测阶段已提取的第一页文本，直接复用，不再重复解析第一页
+func (e *Extractor) batchExtractLocalPdf(r *pdf.Reader, firstPageText string, fields []string, totalPages int, onProgress ProgressCallback) ([]Record, error) {
+	// 复用 extractPdf 已解析的 Reader，供所有 worker 共享 (dslipak/pdf 是并发安全的)
+	pageText := e.localPageTextFunc(firstPageText, func(pageNum int) (string, bool) {
+		return e.extractPageTextWithTimeout(r, pageNum, localPageTimeout)
+	})
 
-	// 1. 预解析一次 Reader，供所有子任务复用 (dslipak/pdf 是并发安全的)
-	r, err := pdf.NewReader(bytes.NewReader(fileData), int64(len(fileData)))
-	if err != nil {
-		return nil, fmt.Errorf("创建 PDF 阅读器失败: %w", err)
+	newWorker := func() (func(int) (string, error), func()) { return pageText, nil }
+	progressMessage := func(int) string { return "正在进行文本层逻辑分析..." }
+	return e.runPageWorkers(totalPages, fields, newWorker, onProgress, progressMessage)
+}
+
+// localPageTextFunc 返回文本层逐页取文本函数，extract 为带超时的单页解析，超时返回 ok=false。
+// 超时页面跳过并通过进度回调告知用户；超时的解析协程仍在后台运行，超时页数达到 maxPageTimeouts 后
+// 不再启动新的解析，其余页面直接跳过，已提取的页面照常返回。
+// 达到上限时其他 worker 上正在进行的解析也可能陆续超时，因此后台残留协程最多
+// maxPageTimeouts + maxPageWorkers - 1 个
+func (e *Extractor) localPageTextFunc(firstPageText string, extract func(pageNum int) (string, bool)) func(int) (string, error) {
+	var timeouts atomic.Int32
+	return func(pageNum int) (string, error) {
+		if pageNum == 1 {
+			return firstPageText, nil
+		}
+		if timeouts.Load() >= maxPageTimeouts {
+			return "", &pageSkippedError{reason: fmt.Sprintf("文本层解析超时页数过多，第 %d 页已跳过", pageNum)}
+		}
+
+		text, ok := extract(pageNum)
+		if ok {
+			return text, nil
+		}
+		e.logger.Warn("页面文本层解析超时，已跳过", "page", pageNum, "timeout", localPageTimeout)
+		timeouts.Add(1)
+		return "", &pageSkippedError{reason: fmt.Sprintf("第 %d 页文本层解析超时，已跳过", pageNum)}
 	}
+}
 
+// runPageWorkers 以有界的 worker 池并行处理第 1..totalPages 页，结果按页码直接落位，保证输出顺序一致且无需事后排序。
+// newWorker 在每个 worker 协程内调用一次，返回该协程的逐页取文本函数与退出时的收尾函数 (可为 nil)，
+// 供 OCR 桥接进程等需要独占的资源按 worker 持有；文本为空白的页面不产生记录。
+// 取文本函数返回 *pageSkippedError 时跳过该页并在进度中说明原因，返回其他错误时中止整个文档
+func (e *Extractor) runPageWorkers(totalPages int, fields []string, newWorker func() (pageText func(pageNum int) (string, error), release func()), onProgress ProgressCallback, progressMessage func(pageNum int) string) ([]Record, error) {
 	type pageResult struct {
 		pageNum int
 		records []Record
 		err     error
 	}
 
-	// 2. 准备并行任务
 	numWorkers := runtime.NumCPU()
-	if numWorkers > 8 {
-		numWorkers = 8 // 限制最大并发，防止内存波动过大
+	if numWorkers > maxPageWorkers {
+		numWorkers = maxPageWorkers
 	}
 	if numWorkers > totalPages {
 		numWorkers = totalPages
 	}
+	e.logger.Info("启动并行提取引擎", "workers", numWorkers)
 
+	// 任务通道容量等于总页数，可以直接一次性投递
 	jobs := make(chan int, totalPages)
-	results := make(chan pageResult, totalPages)
+	for i := 1; i <= totalPages; i++ {
+		jobs <- i
+	}
+	close(jobs)
+
+	// 任一页返回中止错误后，其余 worker 不再领取新页面
+	ctx, cancel := context.WithCancel(context.Background())
+	defer cancel()
 
-	// 3. 启动 Worker Pool
+	results := make(chan pageResult, totalPages)
 	var wg sync.WaitGroup
 	for w := 0; w < numWorkers; w++ {
 		wg.Add(1)
 		go func() {
 			defer wg.Done()
+
+			pageText, release := newWorker()
+			if release != nil {
+				defer release()
+			}
+
 			for pageNum := range jobs {
-				// 提取并解析
-				p := r.Page(pageNum)
-				text, _ := p.GetPlainText(nil)
+				if ctx.Err() != nil {
+					return
+				}
 
+				text, err := pageText(pageNum)
+				if err != nil {
+					var skipped *pageSkippedError
+					if !errors.As(err, &skipped) {
+						cancel()
+					}
+					results <- pageResult{pageNum: pageNum, err: err}
+					continue
+				}
 				if strings.TrimSpace(text) == "" {
 					results <- pageResult{pageNum: pageNum}
 					continue
@@ -233,47 +468,45 @@ func (e *Extractor) batchExtractLocalPdf(fileData []byte, fields []string, total
 		}()
 	}
 
-	// 4. 发送任务
-	go func() {
-		for i := 1; i <= totalPages; i++ {
-			jobs <- i
-		}
-		close(jobs)
-	}()
-
-	// 5. 进度收集与结果汇总
 	go func() {
 		wg.Wait()
 		close(results)
 	}()
 
-	var allPageResults []pageResult
-	processedCount := 0
+	pageRecords := make([][]Record, totalPages+1)
+	processed := 0
+	var abortErr error
 	for res := range results {
-		processedCount++
-		if onProgress != nil {
-			onProgress(processedCount, totalPages, "正在进行文本层逻辑分析...")
+		processed++
+		message := progressMessage(res.pageNum)
+		if res.err != nil {
+			var skipped *pageSkippedError
+			if !errors.As(res.err, &skipped) {
+				if abortErr == nil {
+					abortErr = res.err
+				}
+				continue
+			}
+			message = skipped.reason
 		}
-		if len(res.records) > 0 {
-			allPageResults = append(allPageResults, res)
+		if onProgress != nil {
+			onProgress(processed, totalPages, message)
 		}
+		pageRecords[res.pageNum] = res.records
+	}
+	if abortErr != nil {
+		return nil, abortErr
 	}
-
-	// 6. 按照页码排序，保证输出顺序一致
-	sort.Slice(allPageResults, func(i, j int) bool {
-		return allPageResults[i].pageNum < allPageResults[j].pageNum
-	})
 
 	var finalRecords []Record
-	for _, pr := range allPageResults {
-		finalRecords = append(finalRecords, pr.records...)
+	for _, records := range pageRecords {
+		finalRecords = append(finalRecords, records...)
 	}
-
 	return finalRecords, nil
 }
 
 // extractViaWinOcr 调用 Windows 系统原生 OCR 桥接工具 (并发加速版)
-func (e *Extractor) extractViaWinOcr(fileData []byte, totalPages int, onProgress ProgressCallback) ([]Record, error) {
+func (e *Extractor) extractViaWinOcr(fileData []byte, fields []string, totalPages int, onProgress ProgressCallback) ([]Record, error) {
 	// 1. 创建临时文件存储 PDF 内容
 	tempFile, err := os.CreateTemp("", "legal_ocr_*.pdf")
 	if err != nil {
@@ -298,82 +531,39 @@ func (e *Extractor) extractViaWinOcr(fileData []byte, totalPages int, onProgress
 		}
 	}
 
-	type pageResult struct {
-		pageNum int
-		records []Record
-	}
-
-	// 3. 并行执行 OCR 进程
-	numWorkers := 4 // OCR 进程较重，限制并发数
-	if numWorkers > totalPages {
-		numWorkers = totalPages
-	}
-
-	jobs := make(chan int, totalPages)
-	results := make(chan pageResult, totalPages)
-	var wg sync.WaitGroup
-
-	for w := 0; w < numWorkers; w++ {
-		wg.Add(1)
-		go func() {
-			defer wg.Done()
-			for pageNum := range jobs {
-				cmd := exec.Command(bridgePath, tempFile.Name(), fmt.Sprintf("%d", pageNum))
-				output, err := cmd.CombinedOutput()
-				if err != nil {
-					results <- pageResult{pageNum: pageNum}
-					continue
-				}
+	// 3. 并行识别各页；未指定字段时与 DOCX 一致，提取全部字段
+	return e.recognizePagesViaWinOcr(bridgePath, tempFile.Name(), withDefaultFields(fields), totalPages, onProgress)
+}
 
-				text := strings.TrimSpace(string(output))
-				if text == "" {
-					results <- pageResult{pageNum: pageNum}
-					continue
-				}
+// recognizePagesViaWinOcr 并行执行 OCR (渲染与识别均为 CPU 密集型，按核数扩展) 并按 fields 解析各页文本。
+// 每个 worker 从进程池借用一个常驻桥接进程，逐页发送请求，文档处理完毕后归还，
+// 避免逐页/逐文档启动进程、初始化 OCR 引擎
+func (e *Extractor) recognizePagesViaWinOcr(bridgePath, pdfPath string, fields []string, totalPages int, onProgress ProgressCallback) ([]Record, error) {
+	newWorker := func() (func(int) (string, error), func()) {
+		var bridge *winOcrBridge
 
-				pageRecords := e.parseCases(text, nil)
-				for _, rec := range pageRecords {
-					rec["page"] = fmt.Sprintf("%d", pageNum)
-				}
-				results <- pageResult{pageNum: pageNum, records: pageRecords}
+		pageText := func(pageNum int) (string, error) {
+			b, text, err := e.ocrBridges.recognizeWithRetry(bridge, bridgePath, pdfPath, pageNum)
+			bridge = b
+			if err != nil {
+				e.logger.Warn("OCR 桥接进程识别失败", "page", pageNum, "error", err)
+				return "", &pageSkippedError{reason: fmt.Sprintf("第 %d 页识别失败，已跳过", pageNum)}
 			}
-		}()
-	}
-
-	go func() {
-		for i := 1; i <= totalPages; i++ {
-			jobs <- i
+			return strings.TrimSpace(text), nil
 		}
-		close(jobs)
-	}()
-
-	go func() {
-		wg.Wait()
-		close(results)
-	}()
 
-	var allPageResults []pageResult
-	processed := 0
-	for res := range results {
-		processed++
-		if onProgress != nil {
-			onProgress(processed, totalPages, fmt.Sprintf("正在调用系统识别引擎提取第 %d 页内容...", res.pageNum))
-		}
-		if len(res.records) > 0 {
-			allPageResults = append(allPageResults, res)
+		release := func() {
+			if bridge != nil {
+				e.ocrBridges.release(bridge)
+			}
 		}
+		return pageText, release
 	}
 
-	sort.Slice(allPageResults, func(i, j int) bool {
-		return allPageResults[i].pageNum < allPageResults[j].pageNum
-	})
-
-	var finalRecords []Record
-	for _, pr := range allPageResults {
-		finalRecords = append(finalRecords, pr.records...)
+	progressMessage := func(pageNum int) string {
+		return fmt.Sprintf("正在调用系统识别引擎提取第 %d 页内容...", pageNum)
 	}
-
-	return finalRecords, nil
+	return e.runPageWorkers(totalPages, fields, newWorker, onProgress, progressMessage)
 }
 
 // extractFromDocx 保留原有的本地 DOCX 提取逻辑
@@ -383,13 +573,18 @@ func (e *Extractor) extractFromDocx(fileData []byte, fields []string) ([]Record,
 		return nil, err
 	}
 
-	if len(fields) == 0 {
-		for k := range PatternRegistry {
-			fields = append(fields, k)
-		}
-	}
+	return e.parseCases(text, withDefaultFields(fields)), nil
+}
 
-	return e.parseCases(text, fields), nil
+// withDefaultFields 未指定提取字段时，默认提取 PatternRegistry 中的全部字段
+func withDefaultFields(fields []string) []string {
+	if len(fields) > 0 {
+		return fields
+	}
+	for k := range PatternRegistry {
+		fields = append(fields, k)
+	}
+	return fields
 }
 
 // extractTextFromDocx 核心 DOCX 文本提取逻辑
@@ -418,6 +613,8 @@ func extractTextFromDocx(fileData []byte) (string, error) {
 	decoder := xml.NewDecoder(documentXML)
 	var sb strings.Builder
 
+	// 直接把 <w:t> 内的字符数据写入结果，无需经 DecodeElement 反射解码为中间字符串
+	inText := false
 	for {
 		t, _ := decoder.Token()
 		if t == nil {
@@ -426,13 +623,16 @@ func extractTextFromDocx(fileData []byte) (string, error) {
 		switch se := t.(type) {
 		case xml.StartElement:
 			if se.Name.Local == "t" {
-				var s string
-				if err := decoder.DecodeElement(&s, &se); err == nil {
-					sb.WriteString(s)
-				}
+				inText = true
+			}
+		case xml.CharData:
+			if inText {
+				sb.Write(se)
 			}
 		case xml.EndElement:
 			switch se.Name.Local {
+			case "t":
+				inText = false
 			case "p", "tr":
 				sb.WriteString("\n")
 			case "tc":
@@ -449,16 +649,18 @@ func (e *Extractor) parseCases(text string, fields []string) []Record {
 	parts := DefaultPatterns.Split.Split(text, -1)
 	var data []Record
 
+	// 字段集合只取决于调用参数，在循环外构建一次
+	fieldSet := make(map[string]bool, len(fields))
+	for _, f := range fields {
+		fieldSet[f] = true
+	}
+
 	for _, part := range parts {
 		if strings.TrimSpace(part) == "" {
 			continue
 		}
 
 		record := make(Record)
-		fieldSet := make(map[string]bool)
-		for _, f := range fields {
-			fieldSet[f] = true
-		}
 
 		// 1. 提取被告
 		if fieldSet["defendant"] {
@@ -466,6 +668,11 @@ func (e *Extractor) parseCases(text string, fields []string) []Record {
 			if loc != nil {
 				startIdx := loc[1]
 				remaining := part[startIdx:]
+				// DefEnd 以 "。" 作为结束条件之一，被告名称不会越过第一个句号；
+				// 先截断再去除换行，避免为整段剩余文本 (诉讼请求、事实与理由等) 复制一份副本
+				if idx := strings.Index(remaining, "。"); idx >= 0 {
+					remaining = remaining[:idx]
+				}
 				cleanRemaining := strings.ReplaceAll(remaining, "\n", "")
 				locEnd := DefaultPatterns.DefEnd.FindStringIndex(cleanRemaining)
 
@@ -517,43 +724,91 @@ func (e *Extractor) parseCases(text string, fields []string) []Record {
 // smartMerge 智能合并换行符
 // 逻辑：保留句号、分号、冒号后的换行，或者新条目序号（如"二、"）之前的换行，其他的换行符视作布局造成的干扰并予以合并。
 func smartMerge(s string) string {
-	s = strings.TrimSpace(s)
-	if s == "" {
-		return ""
+	// 单次扫描完成全部清理：标准化换行符，保留"逻辑断点"处的换行，其余换行视作 OCR 碎行，
+	// 连同行内连续空白一起压缩为单个空格，并去掉每行首尾空白与空行
+	// 逻辑断点：句末标点 (。；？！) 之后，或条目序号 (一、 (1) 等) 之前
+	var b strings.Builder
+	b.Grow(len(s))
+	var prev rune
+	pendingSpace, pendingBreak := false, false
+	for i := 0; i < len(s); {
+		r, size := utf8.DecodeRuneInString(s[i:])
+		next := i + size
+
+		switch {
+		case r == '\r' && next < len(s) && s[next] == '\n':
+			// \r\n 视为一个换行符
+			i = next
+			continue
+		case r == '\n':
+			// 连续换行只判断第一个
+			if prev != '\n' && (isSentenceEnd(prev) || startsWithListMarker(s[next:])) {
+				pendingBreak = true
+			} else {
+				// 合并 OCR 碎行：替换为一个小空格，防止文字粘连
+				pendingSpace = true
+			}
+		case unicode.IsSpace(r):
+			pendingSpace = true
+		default:
+			// 分隔符延迟到下一个可见字符前写出，行首行尾空白与空行自然被丢弃
+			if b.Len() > 0 {
+				if pendingBreak {
+					b.WriteByte('\n')
+				} else if pendingSpace {
+					b.WriteByte(' ')
+				}
+			}
+			pendingSpace, pendingBreak = false, false
+			b.WriteString(s[i:next])
+		}
+		prev = r
+		i = next
 	}
 
-	// 1. 标准化换行符
-	s = strings.ReplaceAll(s, "\r\n", "\n")
-	reMultipleNL := regexp.MustCompile(`\n+`)
-	s = reMultipleNL.ReplaceAllString(s, "\n")
+	return b.String()
+}
 
-	// 2. 标记需要保留的"逻辑断点"
-	// A. 句末标点后：。；？！
-	rePreserveAfter := regexp.MustCompile(`([。；？！])\n`)
-	s = rePreserveAfter.ReplaceAllString(s, "$1[LOGICAL_NL]")
+// isSentenceEnd 判断字符是否为句末标点
+func isSentenceEnd(r rune) bool {
+	switch r {
+	case '。', '；', '？', '！':
+		return true
+	}
+	return false
+}
 
-	// B. 条目序号前：\n一、 \n(1) 等
-	rePreserveBefore := regexp.MustCompile(`\n(\s*(?:[一二三四五六七八九十\d]+[、．]|[(（][一二三四五六七八九十\d]+[)）]))`)
-	s = rePreserveBefore.ReplaceAllString(s, "[LOGICAL_NL]$1")
+// isListNumeral 判断字符是否可作为条目序号的数字 (中文数字或阿拉伯数字)
+func isListNumeral(r rune) bool {
+	return (r >= '0' && r <= '9') || strings.ContainsRune("一二三四五六七八九十", r)
+}
 
-	// 3. 合并 OCR 碎行：将剩余的非逻辑换行符替换为一个小空格，防止文字粘连
-	s = strings.ReplaceAll(s, "\n", " ")
+// startsWithListMarker 判断文本 (忽略前导空白) 是否以条目序号开头，如 "一、" "2．" "(3)" "（四）"
+func startsWithListMarker(s string) bool {
+	s = strings.TrimLeft(s, " \t\n\f\r")
 
-	// 4. 将占位符还原为真正的换行符
-	s = strings.ReplaceAll(s, "[LOGICAL_NL]", "\n")
+	open := false
+	if strings.HasPrefix(s, "(") {
+		s, open = s[1:], true
+	} else if strings.HasPrefix(s, "（") {
+		s, open = s[len("（"):], true
+	}
 
-	// 5. 深度清理：合并每行内部的多余空格
-	lines := strings.Split(s, "\n")
-	var resultLines []string
-	for _, line := range lines {
-		trimmed := strings.TrimSpace(line)
-		if trimmed == "" {
-			continue
+	digits := 0
+	for _, r := range s {
+		if !isListNumeral(r) {
+			break
 		}
-		// 压缩行内连续空格，但保留单个空格
-		fields := strings.Fields(trimmed)
-		resultLines = append(resultLines, strings.Join(fields, " "))
+		s = s[utf8.RuneLen(r):]
+		digits++
+	}
+	if digits == 0 || s == "" {
+		return false
 	}
 
-	return strings.Join(resultLines, "\n")
+	r, _ := utf8.DecodeRuneInString(s)
+	if open {
+		return r == ')' || r == '）'
+	}
+	return r == '、' || r == '．'
 }
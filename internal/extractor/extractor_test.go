@@ -1,9 +1,69 @@
 package extractor
 
 import (
+	"archive/zip"
+	"bufio"
+	"bytes"
+	"errors"
+	"fmt"
+	"math/rand"
+	"os"
+	"strings"
+	"sync"
+	"sync/atomic"
 	"testing"
+	"time"
 )
 
+// fakeOcrBridgeEnv 设置该环境变量时，测试二进制自身充当 WinOcrBridge 常驻进程：
+// 对每个 "<path>\t<page>" 请求，返回文件内容 (其中的 {page} 替换为页码) 并以换页符结束；
+// 与真实桥接进程一样，释放文档的空行不产生响应
+const fakeOcrBridgeEnv = "LEGAL_EXTRACTOR_FAKE_OCR_BRIDGE"
+
+func TestMain(m *testing.M) {
+	if os.Getenv(fakeOcrBridgeEnv) == "1" {
+		runFakeOcrBridge()
+		os.Exit(0)
+	}
+	os.Exit(m.Run())
+}
+
+func runFakeOcrBridge() {
+	in := bufio.NewScanner(os.Stdin)
+	out := bufio.NewWriter(os.Stdout)
+	for in.Scan() {
+		path, page, ok := strings.Cut(in.Text(), "\t")
+		if !ok {
+			continue
+		}
+		data, _ := os.ReadFile(path)
+		out.WriteString(strings.ReplaceAll(string(data), "{page}", page))
+		out.WriteString(ocrPageSeparator)
+		out.Flush()
+	}
+}
+
+// fakeOcrBridgePath 返回可作为桥接进程启动的测试二进制路径
+func fakeOcrBridgePath(t *testing.T) string {
+	t.Helper()
+	t.Setenv(fakeOcrBridgeEnv, "1")
+	path, err := os.Executable()
+	if err != nil {
+		t.Fatal(err)
+	}
+	return path
+}
+
+// writeTempFile 写入临时文件并返回路径
+func writeTempFile(t *testing.T, content string) string {
+	t.Helper()
+	path := t.TempDir() + "/doc.pdf"
+	if err := os.WriteFile(path, []byte(content), 0o644); err != nil {
+		t.Fatal(err)
+	}
+	return path
+}
+
 func TestParseCases(t *testing.T) {
 	e := NewExtractor(nil)
 	text := `
@@ -43,6 +103,33 @@ func TestParseCases(t *testing.T) {
 	}
 }
 
+func TestParseCasesDefendantFullStop(t *testing.T) {
+	e := NewExtractor(nil)
+	tests := []struct {
+		name string
+		text string
+		want string
+	}{
+		{"full stop after name", "被告：张三。住址：北京市朝阳区", "张三"},
+		{"full stop before and after", "原告：李四。\n被告：张三。\n诉讼请求：偿还借款。", "张三"},
+		{"name wrapped before full stop", "被告：张\n三。住址：北京市", "张三"},
+		{"keyword before full stop", "被告：张三，身份证号码：110101199001011234。", "张三"},
+		{"full stop right after label", "被告：。张三", ""},
+		{"no full stop", "被告：张三\n", "张三"},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			result := e.parseCases(tt.text, []string{"defendant"})
+			if len(result) != 1 {
+				t.Fatalf("expected 1 record, got %d", len(result))
+			}
+			if got := result[0]["defendant"]; got != tt.want {
+				t.Errorf("defendant = %q, want %q", got, tt.want)
+			}
+		})
+	}
+}
+
 func TestSmartMerge(t *testing.T) {
 	tests := []struct {
 		name  string
@@ -65,6 +152,51 @@ func TestSmartMerge(t *testing.T) {
 			input: "第一句。\n第二句",
 			want:  "第一句。\n第二句",
 		},
+		{
+			name:  "Break before chinese list numbers",
+			input: "诉讼请求如下\n一、偿还借款\n二、承担诉讼费",
+			want:  "诉讼请求如下\n一、偿还借款\n二、承担诉讼费",
+		},
+		{
+			name:  "Break before parenthesized numbers",
+			input: "请求事项\n(1)偿还借款\n (2)承担利息",
+			want:  "请求事项\n(1)偿还借款\n(2)承担利息",
+		},
+		{
+			name:  "Break before full-width parenthesized numbers",
+			input: "理由如下\n（二）被告违约\n（十）其他",
+			want:  "理由如下\n（二）被告违约\n（十）其他",
+		},
+		{
+			name:  "Numbers without list punctuation are merged",
+			input: "共计\n十分\n2．第二项",
+			want:  "共计 十分\n2．第二项",
+		},
+		{
+			name:  "CRLF line endings",
+			input: "第一句。\r\n第二句\r\n继续",
+			want:  "第一句。\n第二句 继续",
+		},
+		{
+			name:  "Blank line runs collapse",
+			input: "甲\n\n\n乙。\n\n\n丙",
+			want:  "甲 乙。\n丙",
+		},
+		{
+			name:  "Ideographic spaces",
+			input: "甲\u3000\u3000乙\n\u3000丙\u3000",
+			want:  "甲 乙 丙",
+		},
+		{
+			name:  "Invalid UTF-8 is kept verbatim",
+			input: "（\xff。！二\r\n（",
+			want:  "（\xff。！二 （",
+		},
+		{
+			name:  "Invalid UTF-8 before a merged newline",
+			input: "甲\xff\n乙",
+			want:  "甲\xff 乙",
+		},
 	}
 
 	for _, tt := range tests {
@@ -76,3 +208,413 @@ func TestSmartMerge(t *testing.T) {
 		})
 	}
 }
+
+func TestCleanMarkdownSymbolOrder(t *testing.T) {
+	// 与逐个 ReplaceAll 的原始实现逐字节一致，包括删除后相邻字符拼出的新符号
+	reference := func(s string) string {
+		s = strings.ReplaceAll(s, "#", "")
+		s = strings.ReplaceAll(s, "**", "")
+		s = strings.ReplaceAll(s, "|", " ")
+		s = strings.ReplaceAll(s, "---", "")
+		s = strings.ReplaceAll(s, "&nbsp;", " ")
+		s = reSectionHeader.ReplaceAllString(s, "")
+		return smartMerge(s)
+	}
+
+	inputs := []string{"a***#*:|", "-**--", "*#*加粗", "-#--", "&nb---sp;", "-|--", "## 标题\n| 列 | 值 |\n---"}
+	rng := rand.New(rand.NewSource(1))
+	alphabet := []string{"a", "#", "*", "-", "|", "&", "nbsp;", "n", "\n", "：", "被告"}
+	for i := 0; i < 20000; i++ {
+		var sb strings.Builder
+		for j := rng.Intn(12); j >= 0; j-- {
+			sb.WriteString(alphabet[rng.Intn(len(alphabet))])
+		}
+		inputs = append(inputs, sb.String())
+	}
+
+	for _, in := range inputs {
+		if got, want := cleanMarkdown(in), reference(in); got != want {
+			t.Fatalf("cleanMarkdown(%q) = %q, want %q", in, got, want)
+		}
+	}
+}
+
+func TestResultCacheEviction(t *testing.T) {
+	e := NewExtractor(nil)
+	for i := 0; i <= maxCacheEntries; i++ {
+		e.putCached(fmt.Sprintf("hash-%d", i), []Record{{"page": fmt.Sprintf("%d", i)}})
+		// 持续访问第一个条目，使其保持为最近使用
+		if _, ok := e.getCached("hash-0"); !ok {
+			t.Fatalf("hash-0 should stay cached after insert %d", i)
+		}
+	}
+
+	if _, ok := e.getCached("hash-1"); ok {
+		t.Errorf("least recently used entry hash-1 should have been evicted")
+	}
+	if got := e.cacheOrder.Len(); got != maxCacheEntries {
+		t.Errorf("cache size = %d, want %d", got, maxCacheEntries)
+	}
+}
+
+// buildDocx 生成仅包含 word/document.xml 的最小 DOCX，每行文本一个段落
+func buildDocx(t *testing.T, lines ...string) []byte {
+	t.Helper()
+	var buf bytes.Buffer
+	zw := zip.NewWriter(&buf)
+	w, err := zw.Create("word/document.xml")
+	if err != nil {
+		t.Fatal(err)
+	}
+	fmt.Fprint(w, `<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>`)
+	for _, line := range lines {
+		fmt.Fprintf(w, "<w:p><w:r><w:t>%s</w:t></w:r></w:p>", line)
+	}
+	fmt.Fprint(w, `</w:body></w:document>`)
+	if err := zw.Close(); err != nil {
+		t.Fatal(err)
+	}
+	return buf.Bytes()
+}
+
+func TestInflightJoin(t *testing.T) {
+	e := NewExtractor(nil)
+
+	// 相同任务只有一个发起者，等待者补收最近一次进度并持续收到后续进度
+	leaderCall, leader := e.joinInflight(".pdf:h1")
+	if !leader {
+		t.Fatalf("first join should lead")
+	}
+	leaderCall.progress(1, 3, "第一页")
+	waiterCall, leader := e.joinInflight(".pdf:h1")
+	if leader || waiterCall != leaderCall {
+		t.Fatalf("second join should wait on the leader's call")
+	}
+	var got []string
+	waiterCall.subscribe(func(current, total int, message string) {
+		got = append(got, fmt.Sprintf("%d/%d %s", current, total, message))
+	})
+	leaderCall.progress(2, 3, "第二页")
+	if want := []string{"1/3 第一页", "2/3 第二页"}; strings.Join(got, "|") != strings.Join(want, "|") {
+		t.Errorf("waiter progress = %q, want %q", got, want)
+	}
+
+	// 相同内容、不同扩展名的请求各自处理
+	if _, leader := e.joinInflight(".jpg:h1"); !leader {
+		t.Errorf("same content with another extension should not join the .pdf call")
+	}
+
+	// 发起者失败：等待者收到同一错误，结果不写入缓存，之后的请求重新发起
+	leaderCall.err = errors.New("boom")
+	e.finishInflight(".pdf:h1", leaderCall)
+	<-waiterCall.done
+	if waiterCall.err == nil {
+		t.Errorf("waiter should observe the leader's error")
+	}
+	if _, ok := e.getCached(".pdf:h1"); ok {
+		t.Errorf("failed extraction should not be cached")
+	}
+	if _, leader := e.joinInflight(".pdf:h1"); !leader {
+		t.Errorf("join after a failed call should lead a new extraction")
+	}
+
+	// 登记前结果已写入缓存：直接返回已完成的任务
+	e.putCached(".pdf:h2", []Record{{"defendant": "张三"}})
+	call, leader := e.joinInflight(".pdf:h2")
+	if leader {
+		t.Fatalf("join after cache fill should not lead")
+	}
+	select {
+	case <-call.done:
+	default:
+		t.Fatalf("cached call should already be done")
+	}
+	if len(call.records) != 1 || call.records[0]["defendant"] != "张三" {
+		t.Errorf("cached call records = %v", call.records)
+	}
+}
+
+func TestInflightLeaderPanic(t *testing.T) {
+	e := NewExtractor(nil)
+	call, _ := e.joinInflight(".pdf:h1")
+	waiter, leader := e.joinInflight(".pdf:h1")
+	if leader {
+		t.Fatalf("second join should wait on the leader's call")
+	}
+
+	// 发起者 panic：等待者收到错误而非空结果，panic 继续传给发起者
+	recovered := func() (r any) {
+		defer func() { r = recover() }()
+		defer e.finishInflight(".pdf:h1", call)
+		panic("boom")
+	}()
+	if recovered != "boom" {
+		t.Errorf("leader should re-panic with the original value, got %v", recovered)
+	}
+
+	<-waiter.done
+	if waiter.err == nil || waiter.records != nil {
+		t.Errorf("waiter got records=%v err=%v, want an error", waiter.records, waiter.err)
+	}
+	if _, leader := e.joinInflight(".pdf:h1"); !leader {
+		t.Errorf("panicked call should be unregistered")
+	}
+}
+
+func TestExtractDataConcurrentDedup(t *testing.T) {
+	e := NewExtractor(nil)
+	docx := buildDocx(t, "民事起诉状", "被告：张三", "身份证号码：110101199001011234")
+
+	// 相同内容分别以 .docx 与 .jpg 并发提交：.jpg 的失败不得传给 .docx 的请求
+	var wg sync.WaitGroup
+	errs := make([]error, 16)
+	results := make([][]Record, 16)
+	for i := range errs {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			ext := ".docx"
+			if i%2 == 1 {
+				ext = ".jpg"
+			}
+			results[i], errs[i] = e.ExtractData(docx, "case"+ext, nil, func(current, total int, message string) {})
+		}(i)
+	}
+	wg.Wait()
+
+	for i, err := range errs {
+		if i%2 == 1 {
+			if err == nil {
+				t.Errorf("call %d (.jpg): expected error", i)
+			}
+			continue
+		}
+		if err != nil {
+			t.Errorf("call %d (.docx): unexpected error %v", i, err)
+			continue
+		}
+		if len(results[i]) != 1 || results[i][0]["defendant"] != "张三" {
+			t.Errorf("call %d (.docx): records = %v", i, results[i])
+		}
+	}
+	if _, ok := e.getCached(".docx:" + e.calculateHash(docx)); !ok {
+		t.Errorf("docx result should be cached")
+	}
+	if len(e.inflight) != 0 {
+		t.Errorf("inflight calls leaked: %d", len(e.inflight))
+	}
+}
+
+func TestWinOcrBridgeProtocol(t *testing.T) {
+	bridgePath := fakeOcrBridgePath(t)
+	pdfPath := writeTempFile(t, "第{page}页\n第二行")
+
+	b, err := startWinOcrBridge(bridgePath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer b.close()
+
+	// 同一进程连续处理多个请求，每个响应以换页符为界，响应中的换行不影响切分
+	for _, page := range []int{1, 7, 12} {
+		got, err := b.recognize(pdfPath, page)
+		if err != nil {
+			t.Fatalf("page %d: %v", page, err)
+		}
+		if want := fmt.Sprintf("第%d页\n第二行", page); got != want {
+			t.Errorf("page %d: got %q, want %q", page, got, want)
+		}
+	}
+}
+
+func TestWinOcrBridgePool(t *testing.T) {
+	bridgePath := fakeOcrBridgePath(t)
+	pdfPath := writeTempFile(t, "page {page}")
+	pool := &winOcrBridgePool{}
+
+	// 归还的进程会被下一次申请复用
+	b, err := pool.acquire(bridgePath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	pool.release(b)
+	if again, _ := pool.acquire(bridgePath); again != b {
+		t.Fatalf("released bridge was not reused")
+	}
+	// 归还时发送的释放通知不会在响应流中留下多余内容
+	if text, err := b.recognize(pdfPath, 5); err != nil || text != "page 5" {
+		t.Fatalf("recognize after release = %q, %v", text, err)
+	}
+
+	// 空闲上限之外归还的进程直接关闭
+	extra := make([]*winOcrBridge, 0, maxIdleOcrBridges+1)
+	extra = append(extra, b)
+	for len(extra) < maxIdleOcrBridges+1 {
+		nb, err := pool.acquire(bridgePath)
+		if err != nil {
+			t.Fatal(err)
+		}
+		extra = append(extra, nb)
+	}
+	for _, nb := range extra {
+		pool.release(nb)
+	}
+	if got := len(pool.idle); got != maxIdleOcrBridges {
+		t.Fatalf("idle bridges = %d, want %d", got, maxIdleOcrBridges)
+	}
+	for len(pool.idle) > 0 {
+		nb, _ := pool.acquire(bridgePath)
+		nb.close()
+	}
+
+	// 空闲期间退出的进程：首次请求失败后换新进程重试，页面内容不丢失
+	dead, err := startWinOcrBridge(bridgePath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	pool.release(dead)
+	dead.cmd.Process.Kill()
+	dead.cmd.Wait()
+	if len(pool.idle) != 1 || pool.idle[0] != dead {
+		t.Fatalf("expected the dead bridge to be the only idle one")
+	}
+
+	live, text, err := pool.recognizeWithRetry(nil, bridgePath, pdfPath, 3)
+	if err != nil {
+		t.Fatalf("recognizeWithRetry: %v", err)
+	}
+	defer live.close()
+	if live == dead {
+		t.Errorf("dead bridge was kept in use")
+	}
+	if text != "page 3" {
+		t.Errorf("got %q, want %q", text, "page 3")
+	}
+}
+
+func TestRecognizePagesViaWinOcr(t *testing.T) {
+	e := NewExtractor(nil)
+	bridgePath := fakeOcrBridgePath(t)
+	pdfPath := writeTempFile(t, "民事起诉状\n被告：张三{page}\n身份证号码：110101199001011234\n")
+	t.Cleanup(func() {
+		for len(e.ocrBridges.idle) > 0 {
+			b, _ := e.ocrBridges.acquire(bridgePath)
+			b.close()
+		}
+	})
+
+	// 未指定字段时 (与 DOCX 一致) 提取全部字段，识别文本按页解析为记录
+	records, err := e.recognizePagesViaWinOcr(bridgePath, pdfPath, withDefaultFields(nil), 3, nil)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(records) != 3 {
+		t.Fatalf("expected 3 records, got %d: %v", len(records), records)
+	}
+	for i, rec := range records {
+		page := fmt.Sprintf("%d", i+1)
+		if rec["page"] != page || rec["defendant"] != "张三"+page || rec["idNumber"] != "110101199001011234" {
+			t.Errorf("record %d = %v", i, rec)
+		}
+	}
+}
+
+func TestLocalPageTextTimeoutCap(t *testing.T) {
+	e := NewExtractor(nil)
+	caseText := "民事起诉状\n被告：张三，男\n"
+
+	// 超时页数达到上限后不再启动新的解析，剩余页面直接跳过
+	var calls []int
+	pageText := e.localPageTextFunc(caseText, func(pageNum int) (string, bool) {
+		calls = append(calls, pageNum)
+		return caseText, pageNum%2 == 0
+	})
+	extracted := map[int]bool{1: true, 2: true, 4: true, 6: true}
+	for pageNum := 1; pageNum <= 10; pageNum++ {
+		text, err := pageText(pageNum)
+		var skipped *pageSkippedError
+		if err != nil && !errors.As(err, &skipped) {
+			t.Fatalf("page %d: timeouts must skip the page, got %v", pageNum, err)
+		}
+		if (err == nil) != extracted[pageNum] || (err == nil && text != caseText) {
+			t.Errorf("page %d: text=%q err=%v", pageNum, text, err)
+		}
+	}
+	if want := []int{2, 3, 4, 5, 6, 7}; fmt.Sprint(calls) != fmt.Sprint(want) {
+		t.Errorf("parsed pages = %v, want %v", calls, want)
+	}
+
+	// 并发处理时已提取的页面照常返回，残留的后台解析不超过上限
+	var parses atomic.Int32
+	pageText = e.localPageTextFunc(caseText, func(int) (string, bool) {
+		parses.Add(1)
+		return "", false
+	})
+	newWorker := func() (func(int) (string, error), func()) { return pageText, nil }
+	var messages []string
+	records, err := e.runPageWorkers(20, []string{"defendant"}, newWorker, func(_, _ int, message string) {
+		messages = append(messages, message)
+	}, func(int) string { return "ok" })
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if len(records) != 1 || records[0]["page"] != "1" {
+		t.Errorf("records = %v, want page 1 only", records)
+	}
+	if n := parses.Load(); n > maxPageTimeouts+maxPageWorkers-1 {
+		t.Errorf("%d parses started, want at most %d", n, maxPageTimeouts+maxPageWorkers-1)
+	}
+	if !strings.Contains(strings.Join(messages, "|"), "超时页数过多") {
+		t.Errorf("pages skipped after the cap not reported, progress messages: %v", messages)
+	}
+}
+
+func TestRunPageWorkersSkipAndAbort(t *testing.T) {
+	e := NewExtractor(nil)
+	caseText := "民事起诉状\n被告：张三，男\n"
+	progressMessage := func(int) string { return "ok" }
+
+	// 跳过的页面不产生记录，原因通过进度回调告知，其余页面照常处理
+	skipWorker := func() (func(int) (string, error), func()) {
+		return func(pageNum int) (string, error) {
+			if pageNum == 2 {
+				return "", &pageSkippedError{reason: "第 2 页已跳过"}
+			}
+			return caseText, nil
+		}, nil
+	}
+	var messages []string
+	records, err := e.runPageWorkers(3, []string{"defendant"}, skipWorker, func(_, _ int, message string) {
+		messages = append(messages, message)
+	}, progressMessage)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if len(records) != 2 || records[0]["page"] != "1" || records[1]["page"] != "3" {
+		t.Errorf("records = %v, want pages 1 and 3", records)
+	}
+	if !strings.Contains(strings.Join(messages, "|"), "第 2 页已跳过") {
+		t.Errorf("skipped page not reported, progress messages: %v", messages)
+	}
+
+	// 中止错误返回给调用方，且其余 worker 不再领取新页面
+	const totalPages = 1000
+	var calls atomic.Int32
+	abortWorker := func() (func(int) (string, error), func()) {
+		return func(pageNum int) (string, error) {
+			calls.Add(1)
+			if pageNum == 1 {
+				return "", errors.New("abort")
+			}
+			time.Sleep(time.Millisecond)
+			return caseText, nil
+		}, nil
+	}
+	records, err = e.runPageWorkers(totalPages, []string{"defendant"}, abortWorker, nil, progressMessage)
+	if err == nil || err.Error() != "abort" || records != nil {
+		t.Fatalf("got records=%d err=%v, want abort error", len(records), err)
+	}
+	if n := calls.Load(); n > maxPageWorkers*2 {
+		t.Errorf("%d pages processed after abort, want at most %d", n, maxPageWorkers*2)
+	}
+}
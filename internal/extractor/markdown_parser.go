@@ -1,10 +1,23 @@
 package extractor
 
 import (
-	"regexp"
 	"strings"
+	"unicode/utf8"
 )
 
+// sectionDelimiterReplacer 在标题和常见法律文书关键词前插入切分标记，增加“此致”作为结束标志
+// 所有关键词在一次扫描中完成替换，无需逐个关键词遍历全文
+var sectionDelimiterReplacer = newSectionDelimiterReplacer("#", "诉讼请求", "事实与理由", "事实和理由", "此致")
+
+// newSectionDelimiterReplacer 构建将每个关键词替换为 "\n[SEP]"+关键词 的替换器
+func newSectionDelimiterReplacer(delimiters ...string) *strings.Replacer {
+	oldnew := make([]string, 0, len(delimiters)*2)
+	for _, d := range delimiters {
+		oldnew = append(oldnew, d, "\n[SEP]"+d)
+	}
+	return strings.NewReplacer(oldnew...)
+}
+
 // ParseMarkdown 针对 PaddleOCR-VL 优化的解析器
 func ParseMarkdown(markdown string) []Record {
 	if markdown == "" {
@@ -16,12 +29,7 @@ func ParseMarkdown(markdown string) []Record {
 	record := make(Record)
 
 	// 2. 按标题和常见关键词切分
-	// 增加对常见法律文书关键词的切分支持，增加“此致”作为结束标志
-	delimiters := []string{"#", "诉讼请求", "事实与理由", "事实和理由", "此致"}
-	content := cleanMd
-	for _, d := range delimiters {
-		content = strings.ReplaceAll(content, d, "\n[SEP]"+d)
-	}
+	content := sectionDelimiterReplacer.Replace(cleanMd)
 	sections := strings.Split(content, "[SEP]")
 
 	for _, section := range sections {
@@ -29,17 +37,15 @@ func ParseMarkdown(markdown string) []Record {
 		if trimmed == "" || strings.HasPrefix(trimmed, "此致") {
 			continue
 		}
-		lowered := strings.ToLower(trimmed)
 
-		if strings.Contains(lowered, "被告") || strings.Contains(lowered, "当事人") {
-			if record["defendant"] == "" {
-				record["defendant"] = extractField(trimmed, "被告")
-			}
+		// 关键词均为中文，无需大小写归一化；被告已找到时跳过关键词扫描
+		if record["defendant"] == "" && (strings.Contains(trimmed, "被告") || strings.Contains(trimmed, "当事人")) {
+			record["defendant"] = extractField(trimmed, "被告")
 		}
-		if strings.Contains(lowered, "诉讼请求") {
+		if strings.Contains(trimmed, "诉讼请求") {
 			record["request"] = cleanMarkdown(trimmed)
 		}
-		if strings.Contains(lowered, "事实") && (strings.Contains(lowered, "理由") || strings.Contains(lowered, "事实经过")) {
+		if strings.Contains(trimmed, "事实") && (strings.Contains(trimmed, "理由") || strings.Contains(trimmed, "事实经过")) {
 			record["factsReason"] = cleanMarkdown(trimmed)
 		}
 	}
@@ -74,55 +80,72 @@ func ParseMarkdown(markdown string) []Record {
 
 // stripHTML 使用正则剥离所有 HTML 标签
 func stripHTML(input string) string {
-	re := regexp.MustCompile(`<[^>]*>`)
-	return re.ReplaceAllString(input, "")
+	// 不含 '<' 的文本不可能有标签，跳过正则替换
+	if strings.IndexByte(input, '<') < 0 {
+		return input
+	}
+	return reHTMLTag.ReplaceAllString(input, "")
 }
 
+// markdownSymbolReplacer 一次扫描替换表格线与空格实体。二者互不重叠，也不会与其他符号拼接出新的匹配
+var markdownSymbolReplacer = strings.NewReplacer(
+	"|", " ", // 表格线
+	"&nbsp;", " ",
+)
+
 // cleanMarkdown 移除 Markdown 格式符号，保持纯文本整洁
 func cleanMarkdown(s string) string {
-	// 移除标题符
+	// 依次移除标题符、粗体符与分隔线：前一步删除后相邻字符可能拼成新的 "**" 或 "---" (如 "*#*")，
+	// 必须按此顺序逐步替换才能一并清除；无匹配时 ReplaceAll 直接返回原串，不产生拷贝
 	s = strings.ReplaceAll(s, "#", "")
-	// 移除粗体符
 	s = strings.ReplaceAll(s, "**", "")
-	// 移除表格线
-	s = strings.ReplaceAll(s, "|", " ")
 	s = strings.ReplaceAll(s, "---", "")
-	s = strings.ReplaceAll(s, "&nbsp;", " ")
+	s = markdownSymbolReplacer.Replace(s)
 
 	// 移除关键词头部，防止内容中重复出现标题
-	reHeader := regexp.MustCompile(`^(?i)(诉讼请求|事实与理由|事实和理由|事实经过)[:：\s]*`)
-	s = reHeader.ReplaceAllString(s, "")
+	s = reSectionHeader.ReplaceAllString(s, "")
 
 	// 规范化换行和空格
 	return smartMerge(s)
 }
 
 // extractField 从行中提取关键字段
+// 直接定位包含关键字的行，无需将全文拆分为行切片
 func extractField(text, keyword string) string {
-	lines := strings.Split(text, "\n")
-	for i, line := range lines {
-		if strings.Contains(line, keyword) {
-			// 尝试分割冒号
-			parts := regexp.MustCompile(`[:：]`).Split(line, 2)
-			val := ""
-			if len(parts) > 1 {
-				val = strings.TrimSpace(parts[1])
-			}
+	rest := text
+	for {
+		idx := strings.Index(rest, keyword)
+		if idx < 0 {
+			return ""
+		}
+		lineStart := strings.LastIndexByte(rest[:idx], '\n') + 1
+		line, after, hasNext := strings.Cut(rest[lineStart:], "\n")
+
+		// 尝试分割冒号
+		val := ""
+		if sep := strings.IndexAny(line, ":："); sep >= 0 {
+			_, size := utf8.DecodeRuneInString(line[sep:])
+			val = strings.TrimSpace(line[sep+size:])
+		}
 
-			// 如果本行没内容，尝试看下一行（处理换行排版）
-			if val == "" && i+1 < len(lines) {
-				val = strings.TrimSpace(lines[i+1])
-			}
+		// 如果本行没内容，尝试看下一行（处理换行排版）
+		if val == "" && hasNext {
+			nextLine, _, _ := strings.Cut(after, "\n")
+			val = strings.TrimSpace(nextLine)
+		}
 
-			if val != "" {
-				// 再次利用 DefEnd 正则清理多余后缀
-				locEnd := DefaultPatterns.DefEnd.FindStringIndex(val)
-				if locEnd != nil {
-					val = val[:locEnd[0]]
-				}
-				return strings.Trim(val, " ,，、;；")
+		if val != "" {
+			// 再次利用 DefEnd 正则清理多余后缀
+			locEnd := DefaultPatterns.DefEnd.FindStringIndex(val)
+			if locEnd != nil {
+				val = val[:locEnd[0]]
 			}
+			return strings.Trim(val, " ,，、;；")
+		}
+
+		if !hasNext {
+			return ""
 		}
+		rest = after
 	}
-	return ""
 }
@@ -35,3 +35,20 @@ var PatternRegistry = map[string]struct {
 	"factsReason": {Label: "事实与理由", Pattern: DefaultPatterns.Facts},
 	"page":        {Label: "页码", Pattern: nil},
 }
+
+// FieldLabels maps field names to their display labels. It is derived from
+// PatternRegistry once at package load and must be treated as read-only.
+var FieldLabels = func() map[string]string {
+	labels := make(map[string]string, len(PatternRegistry))
+	for k, p := range PatternRegistry {
+		labels[k] = p.Label
+	}
+	return labels
+}()
+
+// Helper patterns used by the text cleaning routines. They are compiled once
+// at package load so the per-page and per-section hot paths never recompile.
+var (
+	reHTMLTag       = regexp.MustCompile(`<[^>]*>`)
+	reSectionHeader = regexp.MustCompile(`^(?i)(诉讼请求|事实与理由|事实和理由|事实经过)[:：\s]*`)
+)
@@ -0,0 +1,134 @@
+package extractor
+
+import (
+	"bufio"
+	"fmt"
+	"io"
+	"os/exec"
+	"strings"
+	"sync"
+)
+
+const (
+	// ocrPageSeparator OCR 桥接工具在每页识别结果之后输出的分隔符 (换页符)
+	ocrPageSeparator = "\f"
+	// maxIdleOcrBridges 空闲时保留的常驻桥接进程数量上限
+	maxIdleOcrBridges = 8
+)
+
+// winOcrBridge 一个以常驻模式 (--serve) 运行的 WinOcrBridge 进程
+// 识别引擎只在进程启动时初始化一次，之后可跨页面、跨文档复用
+type winOcrBridge struct {
+	cmd    *exec.Cmd
+	stdin  io.WriteCloser
+	stdout *bufio.Reader
+}
+
+// startWinOcrBridge 以常驻模式启动桥接进程
+func startWinOcrBridge(bridgePath string) (*winOcrBridge, error) {
+	cmd := exec.Command(bridgePath, "--serve")
+	hideConsoleWindow(cmd)
+	stdin, err := cmd.StdinPipe()
+	if err != nil {
+		return nil, err
+	}
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		return nil, err
+	}
+	if err := cmd.Start(); err != nil {
+		return nil, fmt.Errorf("启动 OCR 桥接进程失败: %w", err)
+	}
+
+	return &winOcrBridge{
+		cmd:    cmd,
+		stdin:  stdin,
+		stdout: bufio.NewReader(stdout),
+	}, nil
+}
+
+// recognize 请求识别指定 PDF 文件的某一页，返回识别文本
+func (b *winOcrBridge) recognize(pdfPath string, pageNum int) (string, error) {
+	if _, err := fmt.Fprintf(b.stdin, "%s\t%d\n", pdfPath, pageNum); err != nil {
+		return "", err
+	}
+
+	text, err := b.stdout.ReadString(ocrPageSeparator[0])
+	if err != nil {
+		return "", err
+	}
+	return strings.TrimSuffix(text, ocrPageSeparator), nil
+}
+
+// close 终止进程并回收资源
+func (b *winOcrBridge) close() {
+	b.stdin.Close()
+	b.cmd.Process.Kill()
+	b.cmd.Wait()
+}
+
+// winOcrBridgePool 常驻桥接进程池，避免每个文档重复启动进程与初始化识别引擎
+type winOcrBridgePool struct {
+	mu   sync.Mutex
+	idle []*winOcrBridge
+}
+
+// acquire 取出一个空闲进程，没有时启动新进程
+func (p *winOcrBridgePool) acquire(bridgePath string) (*winOcrBridge, error) {
+	p.mu.Lock()
+	if n := len(p.idle); n > 0 {
+		b := p.idle[n-1]
+		p.idle = p.idle[:n-1]
+		p.mu.Unlock()
+		return b, nil
+	}
+	p.mu.Unlock()
+
+	return startWinOcrBridge(bridgePath)
+}
+
+// release 归还进程供后续文档复用，超出空闲上限时直接关闭。
+// 归还前发送空行，通知桥接进程释放缓存的文档，避免空闲进程长期占用内存
+func (p *winOcrBridgePool) release(b *winOcrBridge) {
+	if _, err := io.WriteString(b.stdin, "\n"); err != nil {
+		b.close()
+		return
+	}
+
+	p.mu.Lock()
+	if len(p.idle) < maxIdleOcrBridges {
+		p.idle = append(p.idle, b)
+		p.mu.Unlock()
+		return
+	}
+	p.mu.Unlock()
+
+	b.close()
+}
+
+// recognizeWithRetry 使用 b 识别一页，b 为 nil 时先从进程池申请。
+// 空闲期间已退出的进程要到第一次请求时才会暴露，此时丢弃它并换一个新启动的进程重试一次。
+// 返回之后应继续使用的进程，失败时为 nil
+func (p *winOcrBridgePool) recognizeWithRetry(b *winOcrBridge, bridgePath, pdfPath string, pageNum int) (*winOcrBridge, string, error) {
+	if b == nil {
+		var err error
+		if b, err = p.acquire(bridgePath); err != nil {
+			return nil, "", err
+		}
+	}
+
+	text, err := b.recognize(pdfPath, pageNum)
+	if err == nil {
+		return b, text, nil
+	}
+	b.close()
+
+	if b, err = startWinOcrBridge(bridgePath); err != nil {
+		return nil, "", err
+	}
+	if text, err = b.recognize(pdfPath, pageNum); err != nil {
+		b.close()
+		return nil, "", err
+	}
+	return b, text, nil
+}
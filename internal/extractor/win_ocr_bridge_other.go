@@ -0,0 +1,8 @@
+//go:build !windows
+
+package extractor
+
+import "os/exec"
+
+// hideConsoleWindow 非 Windows 平台没有控制台窗口，无需处理
+func hideConsoleWindow(cmd *exec.Cmd) {}
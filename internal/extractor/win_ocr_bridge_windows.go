@@ -0,0 +1,17 @@
+//go:build windows
+
+package extractor
+
+import (
+	"os/exec"
+	"syscall"
+)
+
+// createNoWindow Win32 进程创建标志 CREATE_NO_WINDOW
+const createNoWindow = 0x08000000
+
+// hideConsoleWindow 桌面版是 GUI 子系统程序，控制台子进程默认会弹出各自的控制台窗口，
+// 常驻桥接进程在整个会话期间存活，必须隐藏窗口
+func hideConsoleWindow(cmd *exec.Cmd) {
+	cmd.SysProcAttr = &syscall.SysProcAttr{HideWindow: true, CreationFlags: createNoWindow}
+}